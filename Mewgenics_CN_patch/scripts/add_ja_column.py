@@ -1,7 +1,24 @@
 import argparse
+import concurrent.futures
 import csv
+import mmap
 import os
-from typing import List
+from typing import List, Optional, Tuple
+
+# pyarrow があれば一括読み書きの高速パスを使う（なければ標準 csv にフォールバック）
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _read_header(file_path: str) -> List[str]:
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), None) or []
 
 
 def add_column_after(fieldnames: List[str], after_col: str, new_col: str) -> List[str]:
@@ -15,28 +32,147 @@ def add_column_after(fieldnames: List[str], after_col: str, new_col: str) -> Lis
     return fieldnames + [new_col]
 
 
+def _process_file_bytes(
+    file_path: str, write_path: str, new_col: str, after_col: str
+) -> Optional[bool]:
+    """CSV をパースせず、バイト列のまま末尾に空列を足す mmap 高速パス。
+
+    「各行の改行直前に `,` を足すだけ」で済むのは、新列が行末に付き、かつ
+    クォート付きフィールド（埋め込み改行・カンマの可能性）がない場合のみ。
+    適用できない場合は None を返して呼び元にフォールバックさせる。
+    """
+    with open(file_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空ファイルは mmap できない
+            return None
+        with mm:
+            # クォートがあればパーサに任せる（改行やカンマを含む値の可能性）
+            if mm.find(b'"') != -1:
+                return None
+
+            nl = mm.find(b"\n")
+            if nl == -1:
+                return None
+
+            header_bytes = mm[:nl]
+            crlf = header_bytes.endswith(b"\r")
+            if crlf:
+                header_bytes = header_bytes[:-1]
+
+            header_text = header_bytes.decode("utf-8").lstrip("\ufeff")
+            header = next(csv.reader([header_text]), None) or []
+            if not header:
+                return None
+            if new_col in header:
+                return False
+
+            new_header = add_column_after(header, after_col, new_col)
+            if new_header != header + [new_col]:
+                # 行末以外への挿入は行ごとの組み替えが必要なので対象外
+                return None
+
+            body = mm[nl + 1:]
+
+    newline = b"\r\n" if crlf else b"\n"
+    # 改行コードが混在するファイルは、ヘッダと異なる側の行だけ「,」が
+    # 付かない（または \r の後ろに付く）ため高速パスの対象外にする
+    if crlf:
+        if body.count(b"\n") != body.count(b"\r\n"):
+            return None
+    elif b"\r" in body:
+        return None
+
+    # split/join は C 実装なので、行単位でも実質バイトコピーの速度で処理できる
+    lines = body.split(newline)
+    body = newline.join(line + b"," if line else line for line in lines)
+
+    with open(write_path, "wb") as out_f:
+        out_f.write(UTF8_BOM)
+        out_f.write((",".join(new_header)).encode("utf-8"))
+        out_f.write(newline)
+        out_f.write(body)
+    return True
+
+
+def _process_file_arrow(
+    file_path: str, write_path: str, new_col: str, after_col: str
+) -> Optional[bool]:
+    """pyarrow による一括読み書き。適用できない場合は None を返して呼び元にフォールバックさせる。"""
+    header = _read_header(file_path)
+    if not header:
+        return None
+    if new_col in header:
+        return False
+
+    try:
+        table = pacsv.read_csv(
+            file_path,
+            # 値の再フォーマットを避けるため全列を文字列として読む
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in header}
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+
+    # utf-8-sig の BOM が先頭列名に残ることがあるので除去する
+    table = table.rename_columns([name.lstrip("\ufeff") for name in table.column_names])
+    table = table.append_column(new_col, pa.array([""] * table.num_rows, type=pa.string()))
+    table = table.select(add_column_after(header, after_col, new_col))
+
+    with open(write_path, "wb") as f:
+        f.write(UTF8_BOM)
+        pacsv.write_csv(
+            table, f, write_options=pacsv.WriteOptions(quoting_style="needed")
+        )
+    return True
+
+
 def process_file(file_path: str, output_path: str, new_col: str, after_col: str) -> bool:
+    # --inplace では入力を読みながら直接上書きできないため、一時ファイル経由にする
+    inplace = os.path.abspath(output_path) == os.path.abspath(file_path)
+    write_path = output_path + ".tmp" if inplace else output_path
+
+    # パース不要なケースはバイト列コピーで済ませる
+    result = _process_file_bytes(file_path, write_path, new_col, after_col)
+    if result is None and pa is not None:
+        result = _process_file_arrow(file_path, write_path, new_col, after_col)
+    if result is not None:
+        if result and inplace:
+            os.replace(write_path, output_path)
+        return result
+
     with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
         reader = csv.DictReader(f)
         original_fieldnames = reader.fieldnames or []
-        rows = list(reader)
 
-    if new_col in original_fieldnames:
-        return False
+        if new_col in original_fieldnames:
+            return False
 
-    new_fieldnames = add_column_after(list(original_fieldnames), after_col, new_col)
+        new_fieldnames = add_column_after(list(original_fieldnames), after_col, new_col)
 
-    with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=new_fieldnames)
-        writer.writeheader()
-        for row in rows:
-            if new_col not in row:
+        # 行を溜め込まず、読みながらそのまま書き出す
+        with open(write_path, "w", encoding="utf-8-sig", newline="") as out_f:
+            writer = csv.DictWriter(out_f, fieldnames=new_fieldnames)
+            writer.writeheader()
+            for row in reader:
                 row[new_col] = ""
-            writer.writerow(row)
+                writer.writerow(row)
+
+    if inplace:
+        os.replace(write_path, output_path)
 
     return True
 
 
+def _process_one(task: Tuple[str, str, str, str, str]) -> Tuple[str, bool]:
+    """ProcessPoolExecutor 用のトップレベルワーカー（pickle 可能にするため）。"""
+    name, src, dst, new_col, after_col = task
+    return name, process_file(src, dst, new_col, after_col)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="CSV ファイルに新しい言語列を追加する（デフォルト: zh の後に ja 列を追加）。"
@@ -83,17 +219,19 @@ def main() -> None:
     added = 0
     skipped = 0
 
-    for name in csv_files:
-        src = os.path.join(input_dir, name)
-        dst = os.path.join(output_dir, name)
-
-        changed = process_file(src, dst, args.column, args.after)
-        if changed:
-            added += 1
-            print(f"{name}: added '{args.column}' column")
-        else:
-            skipped += 1
-            print(f"{name}: skipped ('{args.column}' already exists)")
+    # ファイル単位で独立なので、コア数分のプロセスで並列処理する
+    tasks = [
+        (name, os.path.join(input_dir, name), os.path.join(output_dir, name), args.column, args.after)
+        for name in csv_files
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for name, changed in executor.map(_process_one, tasks):
+            if changed:
+                added += 1
+                print(f"{name}: added '{args.column}' column")
+            else:
+                skipped += 1
+                print(f"{name}: skipped ('{args.column}' already exists)")
 
     print("-" * 48)
     print(f"files with column added: {added}")
@@ -1,16 +1,27 @@
 import argparse
+import asyncio
 import concurrent.futures
 import csv
+import email.utils
+import functools
+import hashlib
+import http.client
+import io
 import json
 import os
+import random
 import re
-import socket
+import shutil
+import sqlite3
+import sys
+import threading
 import time
 import urllib.error
-import urllib.request
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
-OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_API_HOST = "api.openai.com"
+OPENAI_CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+OPENAI_CHAT_COMPLETIONS_URL = f"https://{OPENAI_API_HOST}{OPENAI_CHAT_COMPLETIONS_PATH}"
 
 TAG_OR_VAR_PATTERN = re.compile(r"\[img:[^\]]+\]|\[[^\]]+\]|\{[^{}]*\}|&nbsp;", re.IGNORECASE)
 ALNUM_PATTERN = re.compile(r"[A-Za-z0-9\u00C0-\u024F\u4E00-\u9FFF]")
@@ -20,6 +31,289 @@ SKIP_FILES = {
     "m_newline_scan_report.csv",
 }
 
+# リトライしてよい HTTP ステータス。4xx の認証・リクエスト不備は即時失敗させる。
+RETRYABLE_HTTP_CODES = {429, 500, 502, 503, 504}
+
+# プロンプト文言を変えたらインクリメントしてキャッシュを無効化する
+SYSTEM_PROMPT_VERSION = "2"
+
+# OpenAI のプロンプトキャッシュは「先頭からバイト一致するプレフィックスが
+# 1024トークン以上」のときに効く。そのためルール・書式例・用語集はすべて
+# この system メッセージ1本に集約し、行ごとに変わる内容は user メッセージ
+# の末尾にだけ置く。この文字列は呼び出し間で一切変化させないこと。
+SYSTEM_PROMPT = (
+    "あなたはゲーム「Mewgenics」のローカライズ翻訳アシスタントです。"
+    "ターゲット言語は日本語です。\n"
+    "\n"
+    "共通ルール：\n"
+    "1) 翻訳結果のみを出力してください。説明、引用符、余計な内容は出力しないでください。\n"
+    "2) 原文中のプレースホルダーやタグ形式を保持し、削除や書き換えをしないでください。"
+    "例: {var}、{catname}、[img:...]、[b]...[/b]、[m:happy]、&nbsp;。\n"
+    "3) 改行構造と意味の自然さを保ち、機械的な直訳を避けてください。\n"
+    "4) 下の用語集にある語は必ず用語集の訳語を使用してください。\n"
+    "\n"
+    "名前フィールド（TYPE: name）のルール：\n"
+    "1) 日本語の短い名前を出力してください。\n"
+    "2) 英語名が造語や辞書にない単語の場合（例: fartoom のような語）、"
+    "説明文の文脈を参考に、可読性とゲームプレイの意味を優先して命名してください。\n"
+    "3) 固有名詞として保持すべき場合を除き、英語をそのまま残さないでください。"
+    "ただしカタカナ表記が自然な場合はカタカナを使用してください。\n"
+    "\n"
+    "説明フィールド（TYPE: desc）のルール：\n"
+    "1) 正確かつ自然に、ゲーム用語に合わせて翻訳してください。\n"
+    "2) 原文に改行がある場合、適切な改行を保持してください。\n"
+    "\n"
+    "バッチ翻訳（JSON 配列入力）のルール：\n"
+    "1) en_desc は文脈の参考情報であり、翻訳対象は en のみです。\n"
+    '2) 入力と同じ順序の JSON オブジェクト {"translations": ["訳1", "訳2", ...]} '
+    "のみを返してください。\n"
+    "\n"
+    "用語集（EN = JA）：\n"
+    "Adrenaline = アドレナリン\n"
+    "All Stats Up = 全ステータスアップ\n"
+    "All Stats Down = 全能力低下\n"
+    "The Alpha = アルファ\n"
+    "Ammo = 弾薬\n"
+    "Attraction = 魅力\n"
+    "Backflip = バク宙\n"
+    "Bleed = 出血\n"
+    "Bleed Thorns = 流血の棘\n"
+    "Blessing of Peace = 平和の祝福\n"
+    "Blind = ブラインド\n"
+    "Bloodzerked = ブラッドザーク\n"
+    "Body Guard = ボディガード\n"
+    "Bounty = 賞金首\n"
+    "Brace = ブレース\n"
+    "Bruise = 打撲\n"
+    "Burn = 火傷\n"
+    "Promote = 昇格\n"
+    "Charge = チャージ\n"
+    "Charge Fists = チャージフィスト\n"
+    "Charisma Up = カリスマアップ\n"
+    "Charisma Down = カリスマダウン\n"
+    "Cleave = 切断\n"
+    "Charmed = 洗脳\n"
+    "Probed = プローブ制御\n"
+    "Confusion = 混乱\n"
+    "Constitution Up = 体力強化\n"
+    "Constitution Down = 体力低下\n"
+    "Counter Attack = 反撃\n"
+    "Crit Chance Up = クリティカル率アップ\n"
+    "Damage Up = 攻撃力アップ\n"
+    "Damage Down = ダメージダウン\n"
+    "Late Bloomer = 遅咲き\n"
+    "Delayed Pain = 遅延ダメージ\n"
+    "Dexterity Up = 器用さアップ\n"
+    "Dexterity Down = 器用さ低下\n"
+    "Holy Shield = 聖なる盾\n"
+    "Dodge = 回避\n"
+    "Dodge Chance = 回避率\n"
+    "Doomed = 運命の刻印\n"
+    "Double Action = ダブルアクション\n"
+    "Double Cast = 二重詠唱\n"
+    "Drowsy = うとうと\n"
+    "Possessed by Dybbuk = ディブック憑き\n"
+    "Empty Mind = 無心の心\n"
+    "Exhaustion = 消耗\n"
+    "Extra Attacks = 追加攻撃\n"
+    "Extra Moves = 追加移動\n"
+    "Fear = 恐怖\n"
+    "Free Spell = 無償呪文\n"
+    "Freeze = フリーズ\n"
+    "Grappled = 拘束\n"
+    "Health Regen = 体力再生\n"
+    "Heavier Hits = 重撃\n"
+    "Heavy Hits = ヘビーヒッツ\n"
+    "Hex = ヘックス\n"
+    "Immobile = 固定\n"
+    "Infested = 寄生体\n"
+    "Intelligence Up = 知力アップ\n"
+    "Intelligence Down = 知力低下\n"
+    "Invulnerable = 無敵\n"
+    "Kinetic Spikes = キネティックスパイク\n"
+)
+
+DEFAULT_CACHE_FILENAME = "translations.cache.sqlite"
+
+
+class TranslationCache:
+    """翻訳結果を (model, key, en_text) のハッシュで永続化する SQLite キャッシュ。
+
+    再実行時は API を呼ばずにヒットした訳をそのまま返せるため、
+    2回目以降の実行は新規文字列の分だけで済む。
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (hash TEXT PRIMARY KEY, ja TEXT, created_at INTEGER)"
+        )
+        self._conn.commit()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def make_hash(model: str, key: str, en_text: str) -> str:
+        raw = "|".join((model, SYSTEM_PROMPT_VERSION, key, en_text))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, hash_key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT ja FROM cache WHERE hash = ?", (hash_key,)).fetchone()
+        return row[0] if row else None
+
+    async def put(self, hash_key: str, ja_text: str) -> None:
+        async with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (hash, ja, created_at) VALUES (?, ?, ?)",
+                (hash_key, ja_text, int(time.time())),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class AdaptiveLimiter:
+    """AIMD（加算増加・乗算減少）で同時リクエスト数を自動調整するセマフォ。
+
+    成功が続けば確率 1/current_limit で枠を1つ増やし、429/5xx を受けたら
+    枠を半減させる。アカウントの実効レート上限に自動で張り付くため、
+    --workers の手動チューニングが不要になる。
+    """
+
+    def __init__(self, initial: int, max_limit: int, min_limit: int = 1) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.current_limit = min(max(initial, self.min_limit), self.max_limit)
+        self._semaphore = asyncio.Semaphore(self.current_limit)
+        self._debt = 0  # 縮小時にリリースせず回収する予定の枠数
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._debt > 0:
+            self._debt -= 1
+        else:
+            self._semaphore.release()
+
+    def on_success(self) -> None:
+        if self.current_limit >= self.max_limit:
+            return
+        if random.random() < 1.0 / self.current_limit:
+            self.current_limit += 1
+            self._semaphore.release()
+            print(f"[aimd] 同時リクエスト数 -> {self.current_limit}", file=sys.stderr)
+
+    def on_throttle(self) -> None:
+        new_limit = max(self.min_limit, self.current_limit // 2)
+        if new_limit >= self.current_limit:
+            return
+        self._debt += self.current_limit - new_limit
+        self.current_limit = new_limit
+        print(f"[aimd] 同時リクエスト数 -> {self.current_limit} (throttled)", file=sys.stderr)
+
+
+def _parse_retry_after(value: str) -> float:
+    """Retry-After ヘッダ（秒数または HTTP-date）を秒に変換する。"""
+    value = value.strip()
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Python 3.10 以降の parsedate_to_datetime は解析失敗で ValueError を送出する
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except ValueError:
+        return 0.0
+    if parsed is None:
+        return 0.0
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+def _parse_ratelimit_reset(value: str) -> float:
+    """x-ratelimit-reset-requests の "250ms" / "1.5s" / "1m30s" 形式を秒に変換する。"""
+    value = value.strip().lower()
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r"([0-9.]+)(ms|s|m|h)", value):
+        try:
+            number = float(amount)
+        except ValueError:
+            return 0.0
+        total += number * {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}[unit]
+    return total
+
+
+def _retry_hint_sec(headers) -> float:
+    """レスポンスヘッダから API が指示する待機秒数を取り出す（なければ 0）。"""
+    if not headers:
+        return 0.0
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        hint = _parse_retry_after(retry_after)
+        if hint > 0:
+            return hint
+    reset = headers.get("x-ratelimit-reset-requests")
+    if reset:
+        return _parse_ratelimit_reset(reset)
+    return 0.0
+
+
+def backoff_retry(
+    max_tries: int,
+    base: float = 1.0,
+    factor: float = 2.0,
+    max_delay: float = 60.0,
+    jitter: bool = True,
+) -> Callable:
+    """指数バックオフ付きリトライデコレータ（コルーチン用）。
+
+    429/5xx とネットワークエラー（タイムアウト・切断・DNS 失敗等）のみ
+    リトライし、400/401/403 等は即時に送出する。Retry-After /
+    x-ratelimit-reset-requests があればその指示を優先して待機する。
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            last_error: Optional[BaseException] = None
+            for attempt in range(max_tries):
+                hint = 0.0
+                try:
+                    return await func(*args, **kwargs)
+                except urllib.error.HTTPError as e:
+                    if e.code not in RETRYABLE_HTTP_CODES:
+                        raise
+                    hint = _retry_hint_sec(e.headers)
+                    last_error = e
+                except (OSError, http.client.HTTPException) as e:
+                    # http.client 直叩きのトランスポート層エラー
+                    # （ConnectionError・socket.gaierror・timeout 等は OSError 配下）
+                    last_error = e
+
+                if attempt + 1 >= max_tries:
+                    break
+                delay = min(base * factor ** attempt, max_delay)
+                if jitter:
+                    delay *= random.uniform(0.5, 1.5)
+                await asyncio.sleep(max(hint, delay))
+
+            assert last_error is not None
+            raise last_error
+
+        return wrapper
+
+    return decorator
+
 
 def normalize_text(value: Optional[str]) -> str:
     if value is None:
@@ -68,41 +362,76 @@ def load_targets_from_report(report_path: str, target_col_name: str) -> Dict[str
     return targets
 
 
-def should_skip_row(row: Dict[str, str]) -> bool:
-    key = normalize_text(row.get("KEY"))
+def should_skip_row(row: List[str], key: str) -> bool:
     if key.startswith("//"):
         return True
-    return all(normalize_text(v) == "" for v in row.values())
+    # 空行判定は最初の非空値で即 False になる。csv.reader の値は None に
+    # ならないため normalize_text を介さず strip だけで済む
+    return all(not v or not v.strip() for v in row)
+
 
+def build_desc_index(
+    rows: List[List[str]], key_idx: int, en_idx: int, target_idx: int
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """_DESC 行の en とターゲット訳だけを base キーで索引する。
 
-def build_key_index(rows: List[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
-    index: Dict[str, Dict[str, str]] = {}
+    文脈参照に必要なのはこの2列だけなので、行全体を持つ索引より
+    大幅に小さく、引く側も辞書2回の lookup で済む。
+    """
+    en_desc_by_base: Dict[str, str] = {}
+    target_desc_by_base: Dict[str, str] = {}
     for row in rows:
-        key = normalize_text(row.get("KEY"))
-        if key:
-            index[key] = row
-    return index
+        key = normalize_text(row[key_idx])
+        if key.endswith("_DESC"):
+            base = key[: -len("_DESC")]
+            en_desc_by_base[base] = row[en_idx]
+            target_desc_by_base[base] = row[target_idx]
+    return en_desc_by_base, target_desc_by_base
 
 
 def get_desc_context(
-    row_key: str, key_index: Dict[str, Dict[str, str]], target_col: str
+    row_key: str,
+    en_desc_by_base: Dict[str, str],
+    target_desc_by_base: Dict[str, str],
 ) -> Tuple[str, str]:
     if not row_key.endswith("_NAME"):
         return "", ""
 
     base = row_key[: -len("_NAME")]
-    desc_key = f"{base}_DESC"
-    desc_row = key_index.get(desc_key)
-    if not desc_row:
-        return "", ""
+    return en_desc_by_base.get(base, ""), target_desc_by_base.get(base, "")
+
+
+# TLS ハンドシェイクを毎回払わないよう、ワーカースレッドごとに
+# keep-alive 接続を使い回す
+_thread_local = threading.local()
 
-    en_desc = desc_row.get("en") or ""
-    target_desc = desc_row.get(target_col) or ""
-    return en_desc, target_desc
+# 接続確立（DNS・TCP・TLS）は読み取りより短いタイムアウトで早めに失敗させ、
+# リトライとフェイルオーバーを速く回す
+CONNECT_TIMEOUT_SEC = 10
 
 
-def call_openai_chat(
-    api_key: str, model: str, system_prompt: str, user_prompt: str, timeout_sec: int = 90
+def _get_connection() -> http.client.HTTPSConnection:
+    conn = getattr(_thread_local, "conn", None)
+    if conn is None:
+        conn = http.client.HTTPSConnection(OPENAI_API_HOST, timeout=CONNECT_TIMEOUT_SEC)
+        _thread_local.conn = conn
+    return conn
+
+
+def _drop_connection() -> None:
+    conn = getattr(_thread_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _thread_local.conn = None
+
+
+def _post_openai_chat(
+    api_key: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    timeout_sec: int = 90,
+    response_format: Optional[Dict[str, str]] = None,
 ) -> str:
     payload = {
         "model": model,
@@ -112,20 +441,44 @@ def call_openai_chat(
             {"role": "user", "content": user_prompt},
         ],
     }
+    if response_format is not None:
+        payload["response_format"] = response_format
 
-    req = urllib.request.Request(
-        OPENAI_CHAT_COMPLETIONS_URL,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
-    )
+    request_body = json.dumps(payload).encode("utf-8")
+    request_headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+
+    # サーバー側で切られた keep-alive 接続は1回だけ張り直す
+    for attempt in range(2):
+        conn = _get_connection()
+        try:
+            conn.request(
+                "POST", OPENAI_CHAT_COMPLETIONS_PATH, body=request_body, headers=request_headers
+            )
+            # 接続確立後は応答待ちに読み取り用のタイムアウトを適用する
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout_sec)
+            resp = conn.getresponse()
+            resp_body = resp.read()
+        except (http.client.HTTPException, ConnectionError, BrokenPipeError):
+            _drop_connection()
+            if attempt > 0:
+                raise
+            continue
+        except BaseException:
+            # タイムアウト等は接続状態が不定なので破棄する
+            _drop_connection()
+            raise
+        break
+
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            OPENAI_CHAT_COMPLETIONS_URL, resp.status, resp.reason, resp.headers, io.BytesIO(resp_body)
+        )
 
-    with urllib.request.urlopen(req, timeout=timeout_sec) as resp:
-        body = resp.read().decode("utf-8")
-        data = json.loads(body)
+    data = json.loads(resp_body.decode("utf-8"))
 
     choices = data.get("choices") or []
     if not choices:
@@ -136,6 +489,35 @@ def call_openai_chat(
     return content.strip()
 
 
+async def call_openai_chat(
+    limiter: AdaptiveLimiter,
+    api_key: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    timeout_sec: int = 90,
+    response_format: Optional[Dict[str, str]] = None,
+) -> str:
+    """リミッターで全ファイル横断の同時リクエスト数を制御しつつ API を呼ぶ。"""
+    async with limiter:
+        try:
+            result = await asyncio.to_thread(
+                _post_openai_chat,
+                api_key,
+                model,
+                system_prompt,
+                user_prompt,
+                timeout_sec,
+                response_format,
+            )
+        except urllib.error.HTTPError as e:
+            if e.code in RETRYABLE_HTTP_CODES:
+                limiter.on_throttle()
+            raise
+        limiter.on_success()
+        return result
+
+
 def sanitize_model_output(text: str) -> str:
     s = text.strip()
     s = re.sub(r"^```[a-zA-Z]*\n", "", s)
@@ -143,7 +525,8 @@ def sanitize_model_output(text: str) -> str:
     return s.strip()
 
 
-def translate_text(
+async def translate_text(
+    limiter: AdaptiveLimiter,
     api_key: str,
     model: str,
     key: str,
@@ -153,24 +536,22 @@ def translate_text(
     target_desc: str,
     retries: int,
     sleep_sec: float,
+    cache: Optional[TranslationCache] = None,
 ) -> str:
-    system_prompt = (
-        "あなたはゲームローカライズ翻訳アシスタントです。"
-        "ターゲット言語は日本語です。"
-        "翻訳結果のみを出力してください。説明、引用符、余計な内容は出力しないでください。"
-        "原文中のプレースホルダーやタグ形式を保持してください。例: {var}、[img:...]、[b]...[/b]。"
-        "改行構造と意味の自然さを保ち、機械的な直訳を避けてください。"
-    )
+    cache_hash = ""
+    if cache is not None:
+        cache_hash = TranslationCache.make_hash(model, key, en_text)
+        cached = cache.get(cache_hash)
+        if cached:
+            return cached
+
+    system_prompt = SYSTEM_PROMPT
 
+    # ルールはすべてキャッシュ対象の system メッセージ側にあるので、
+    # user メッセージには行ごとに変わる値だけを入れる
     if row_type == "name":
         user_prompt = (
-            "ゲームの名前フィールドを翻訳してください。\n"
-            "ルール：\n"
-            "1) 日本語の短い名前を出力してください。\n"
-            "2) 英語名が造語や辞書にない単語の場合（例: fartoom のような語）、"
-            "説明文の文脈を参考に、可読性とゲームプレイの意味を優先して命名してください。\n"
-            "3) 固有名詞として保持すべき場合を除き、英語をそのまま残さないでください。"
-            "ただしカタカナ表記が自然な場合はカタカナを使用してください。\n"
+            "TYPE: name\n"
             f"KEY: {key}\n"
             f"EN_NAME: {en_text}\n"
             f"EN_DESC_CONTEXT: {en_desc}\n"
@@ -179,41 +560,237 @@ def translate_text(
         )
     else:
         user_prompt = (
-            "ゲームの説明フィールドを日本語に翻訳してください。\n"
-            "ルール：\n"
-            "1) 正確かつ自然に、ゲーム用語に合わせて翻訳してください。\n"
-            "2) プレースホルダーやタグを保持し、削除や書き換えをしないでください。\n"
-            "3) 原文に改行がある場合、適切な改行を保持してください。\n"
+            "TYPE: desc\n"
             f"KEY: {key}\n"
             f"EN_DESC: {en_text}\n"
             "日本語の説明のみを返してください。"
         )
 
-    last_error = None
-    for attempt in range(retries + 1):
+    call_with_backoff = backoff_retry(
+        max_tries=retries + 1,
+        base=sleep_sec if sleep_sec > 0 else 1.0,
+    )(call_openai_chat)
+
+    try:
+        result = await call_with_backoff(limiter, api_key, model, system_prompt, user_prompt)
+    except urllib.error.HTTPError as e:
+        message = f"HTTP {e.code}"
         try:
-            result = call_openai_chat(api_key, model, system_prompt, user_prompt)
-            result = sanitize_model_output(result)
-            if result:
-                return result
-        except urllib.error.HTTPError as e:
-            last_error = f"HTTP {e.code}"
-            try:
-                err_body = e.read().decode("utf-8", errors="ignore")
-                if err_body:
-                    last_error = f"{last_error}: {err_body[:300]}"
-            except Exception:
-                pass
-        except Exception as e:
-            last_error = str(e)
+            err_body = e.read().decode("utf-8", errors="ignore")
+            if err_body:
+                message = f"{message}: {err_body[:300]}"
+        except Exception:
+            pass
+        raise RuntimeError(message) from e
+    except Exception as e:
+        raise RuntimeError(str(e)) from e
+
+    result = sanitize_model_output(result)
+    if not result:
+        raise RuntimeError("empty api response")
+    if cache is not None:
+        await cache.put(cache_hash, result)
+    return result
+
+
+def _row_type(key: str) -> str:
+    return (
+        "name" if key.endswith("_NAME")
+        else "desc" if key.endswith("_DESC")
+        else "generic"
+    )
 
-        if attempt < retries:
-            time.sleep(sleep_sec)
 
-    raise RuntimeError(last_error or "unknown api error")
+def _apply_translation(
+    row: List[str], key: str, en_text: str, target_idx: int, translated: str
+) -> Optional[bool]:
+    """翻訳結果を検証して row に書き込む。破棄した場合は None を返す。"""
+    if not translated:
+        return None
 
+    # 翻訳結果が入力の3倍以上長い場合はモデルの拒否/暴走とみなして破棄
+    if len(translated) > max(len(en_text) * 3, 100):
+        print(f"  [{key}] SKIPPED (output too long): {translated[:80]}")
+        return None
 
-def process_file(
+    row[target_idx] = translated
+    print(f"  [{key}] {en_text[:60]} -> {translated[:60]}")
+    return True
+
+
+async def _translate_row(
+    limiter: AdaptiveLimiter,
+    row: List[str],
+    key: str,
+    en_text: str,
+    api_key: str,
+    model: str,
+    desc_index: Tuple[Dict[str, str], Dict[str, str]],
+    target_idx: int,
+    retries: int,
+    sleep_sec: float,
+    cache: Optional[TranslationCache],
+) -> Optional[bool]:
+    """1行を翻訳して row を更新する。
+
+    成功なら True、API エラーなら False、結果を破棄した場合は None を返す。
+    """
+    row_type = _row_type(key)
+    en_desc_ctx, target_desc_ctx = get_desc_context(key, *desc_index)
+
+    try:
+        translated = await translate_text(
+            limiter=limiter,
+            api_key=api_key,
+            model=model,
+            key=key,
+            en_text=en_text,
+            row_type=row_type,
+            en_desc=en_desc_ctx,
+            target_desc=target_desc_ctx,
+            retries=retries,
+            sleep_sec=sleep_sec,
+            cache=cache,
+        )
+    except Exception as e:
+        print(f"  [{key}] FAILED: {e}")
+        return False
+
+    return _apply_translation(row, key, en_text, target_idx, translated)
+
+
+def _parse_batch_reply(raw: str, expected: int) -> Optional[List[str]]:
+    """バッチ応答の JSON を検証して訳文リストを返す。形式不正なら None。"""
+    try:
+        data = json.loads(sanitize_model_output(raw))
+    except json.JSONDecodeError:
+        return None
+
+    if isinstance(data, dict):
+        data = data.get("translations")
+    if not isinstance(data, list) or len(data) != expected:
+        return None
+    if not all(isinstance(item, str) for item in data):
+        return None
+    return [item.strip() for item in data]
+
+
+async def _translate_batch(
+    limiter: AdaptiveLimiter,
+    batch: List[Tuple[List[str], str]],
+    api_key: str,
+    model: str,
+    desc_index: Tuple[Dict[str, str], Dict[str, str]],
+    en_idx: int,
+    target_idx: int,
+    retries: int,
+    sleep_sec: float,
+    cache: Optional[TranslationCache],
+) -> List[Optional[bool]]:
+    """同種の複数行を1回のチャット補完でまとめて翻訳する。
+
+    キャッシュヒット行は API に送らない。応答の配列長が合わない・JSON が
+    壊れている場合は1行ずつの翻訳にフォールバックする。
+    """
+    results: List[Optional[bool]] = [None] * len(batch)
+
+    # キャッシュ済みの行を先に確定させ、未訳行だけを API に回す
+    pending: List[int] = []
+    for i, (row, key) in enumerate(batch):
+        if cache is not None:
+            cached = cache.get(TranslationCache.make_hash(model, key, row[en_idx]))
+            if cached:
+                results[i] = _apply_translation(row, key, row[en_idx], target_idx, cached)
+                continue
+        pending.append(i)
+
+    if not pending:
+        return results
+
+    async def _fallback_rows(indices: List[int]) -> None:
+        sub = await asyncio.gather(
+            *[
+                _translate_row(
+                    limiter,
+                    batch[i][0],
+                    batch[i][1],
+                    batch[i][0][en_idx],
+                    api_key,
+                    model,
+                    desc_index,
+                    target_idx,
+                    retries,
+                    sleep_sec,
+                    cache,
+                )
+                for i in indices
+            ]
+        )
+        for i, r in zip(indices, sub):
+            results[i] = r
+
+    if len(pending) == 1:
+        await _fallback_rows(pending)
+        return results
+
+    row_type = _row_type(batch[pending[0]][1])
+    items = []
+    for i in pending:
+        row, key = batch[i]
+        en_desc, _ = get_desc_context(key, *desc_index)
+        items.append({"key": key, "en": row[en_idx], "en_desc": en_desc})
+
+    # バッチ翻訳のルールも system メッセージ側に記載済み
+    user_prompt = (
+        f"TYPE: {row_type}\n"
+        "次の JSON 配列の各要素を日本語に翻訳してください。\n"
+        f"{json.dumps(items, ensure_ascii=False)}"
+    )
+
+    call_with_backoff = backoff_retry(
+        max_tries=retries + 1,
+        base=sleep_sec if sleep_sec > 0 else 1.0,
+    )(call_openai_chat)
+
+    translations: Optional[List[str]] = None
+    try:
+        raw = await call_with_backoff(
+            limiter,
+            api_key,
+            model,
+            SYSTEM_PROMPT,
+            user_prompt,
+            response_format={"type": "json_object"},
+        )
+        translations = _parse_batch_reply(raw, len(pending))
+    except urllib.error.HTTPError as e:
+        print(f"  batch({len(pending)} rows) FAILED: HTTP {e.code}")
+        if e.code not in RETRYABLE_HTTP_CODES:
+            # 認証エラー等のリトライ不能な失敗は1行ずつ送り直しても
+            # 同じ結果にしかならないので、再送せず全行を失敗扱いにする
+            for i in pending:
+                results[i] = False
+            return results
+    except Exception as e:
+        print(f"  batch({len(pending)} rows) FAILED: {e}")
+
+    if translations is None:
+        # 形式不正・配列長不一致・一時的なエラー時は1行ずつ翻訳し直す
+        await _fallback_rows(pending)
+        return results
+
+    for i, translated in zip(pending, translations):
+        row, key = batch[i]
+        applied = _apply_translation(row, key, row[en_idx], target_idx, translated)
+        results[i] = applied
+        if applied and cache is not None:
+            await cache.put(TranslationCache.make_hash(model, key, row[en_idx]), translated)
+
+    return results
+
+
+async def process_file(
+    limiter: AdaptiveLimiter,
     file_path: str,
     output_path: str,
     api_key: str,
@@ -223,81 +800,106 @@ def process_file(
     sleep_sec: float,
     max_rows: int,
     report_targets: Optional[set],
+    cache: Optional[TranslationCache] = None,
+    batch_size: int = 1,
 ) -> Tuple[int, int]:
-    translated_rows = 0
-    failed_rows = 0
+    # レポートに1件も載っていないファイルはパースも再シリアライズも不要。
+    # バイト列コピーだけで済ませる（同一パスへの --inplace 相当なら何もしない）
+    if report_targets is not None and not report_targets:
+        if os.path.abspath(file_path) != os.path.abspath(output_path):
+            shutil.copyfile(file_path, output_path)
+        return 0, 0
 
     with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames or []
-        rows = list(reader)
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        rows = [row for row in reader if row]
 
-    if "en" not in fieldnames or target_col not in fieldnames:
+    # 列名→インデックスを先に引いておき、行は dict 化せずリストのまま扱う
+    col_idx = {name: i for i, name in enumerate(header)}
+
+    if "en" not in col_idx or target_col not in col_idx:
         with open(output_path, "w", encoding="utf-8-sig", newline="") as out_f:
-            writer = csv.DictWriter(out_f, fieldnames=fieldnames)
-            if fieldnames:
-                writer.writeheader()
+            writer = csv.writer(out_f)
+            if header:
+                writer.writerow(header)
             writer.writerows(rows)
         return 0, 0
 
-    key_index = build_key_index(rows)
-
-    with open(output_path, "w", encoding="utf-8-sig", newline="") as out_f:
-        writer = csv.DictWriter(out_f, fieldnames=fieldnames)
-        if fieldnames:
-            writer.writeheader()
-
-        for row in rows:
-            if should_skip_row(row):
-                writer.writerow(row)
-                continue
+    key_idx = col_idx.get("KEY")
+    en_idx = col_idx["en"]
+    target_idx = col_idx[target_col]
 
-            key = normalize_text(row.get("KEY"))
-            en_text = row.get("en") or ""
-            target_text = row.get(target_col) or ""
-
-            if report_targets is not None and key not in report_targets:
-                writer.writerow(row)
-                continue
+    # 短い行があっても添字アクセスできるよう列数を揃える
+    n_cols = len(header)
+    for row in rows:
+        if len(row) < n_cols:
+            row.extend([""] * (n_cols - len(row)))
 
-            if is_symbolic_or_tag_only(en_text):
-                writer.writerow(row)
-                continue
+    desc_index = (
+        build_desc_index(rows, key_idx, en_idx, target_idx)
+        if key_idx is not None
+        else ({}, {})
+    )
 
-            need_translate = is_missing_translation(en_text, target_text)
-            if need_translate and (max_rows <= 0 or translated_rows < max_rows):
-                row_type = (
-                    "name" if key.endswith("_NAME")
-                    else "desc" if key.endswith("_DESC")
-                    else "generic"
-                )
-                en_desc_ctx, target_desc_ctx = get_desc_context(key, key_index, target_col)
+    # 翻訳対象行を先に集め、セマフォの範囲で一斉に翻訳する
+    need: List[Tuple[List[str], str]] = []
+    for row in rows:
+        key = normalize_text(row[key_idx]) if key_idx is not None else ""
+        if should_skip_row(row, key):
+            continue
+
+        en_text = row[en_idx]
+        target_text = row[target_idx]
+
+        if report_targets is not None and key not in report_targets:
+            continue
+        if is_symbolic_or_tag_only(en_text):
+            continue
+        if is_missing_translation(en_text, target_text):
+            need.append((row, key))
+
+    if max_rows > 0:
+        need = need[:max_rows]
+
+    # 同種（name/desc/generic）の行を出現順のまま batch_size 件ずつまとめる。
+    # このデータは NAME/DESC が交互に並ぶため、隣接行だけでは束にならない
+    batch_size = max(1, batch_size)
+    by_type: Dict[str, List[List[Tuple[List[str], str]]]] = {}
+    for row, key in need:
+        row_type = _row_type(key)
+        buckets = by_type.setdefault(row_type, [[]])
+        if len(buckets[-1]) >= batch_size:
+            buckets.append([])
+        buckets[-1].append((row, key))
+    batches = [batch for buckets in by_type.values() for batch in buckets if batch]
+
+    batch_results = await asyncio.gather(
+        *[
+            _translate_batch(
+                limiter,
+                batch,
+                api_key,
+                model,
+                desc_index,
+                en_idx,
+                target_idx,
+                retries,
+                sleep_sec,
+                cache,
+            )
+            for batch in batches
+        ]
+    )
+    results = [r for batch in batch_results for r in batch]
+    translated_rows = sum(1 for r in results if r is True)
+    failed_rows = sum(1 for r in results if r is False)
 
-                try:
-                    translated = translate_text(
-                        api_key=api_key,
-                        model=model,
-                        key=key,
-                        en_text=en_text,
-                        row_type=row_type,
-                        en_desc=en_desc_ctx,
-                        target_desc=target_desc_ctx,
-                        retries=retries,
-                        sleep_sec=sleep_sec,
-                    )
-                    if translated:
-                        # 翻訳結果が入力の3倍以上長い場合はモデルの拒否/暴走とみなして破棄
-                        if len(translated) > max(len(en_text) * 3, 100):
-                            print(f"  [{key}] SKIPPED (output too long): {translated[:80]}")
-                        else:
-                            row[target_col] = translated
-                            translated_rows += 1
-                            print(f"  [{key}] {en_text[:60]} -> {translated[:60]}")
-                except Exception as e:
-                    failed_rows += 1
-                    print(f"  [{key}] FAILED: {e}")
-
-            writer.writerow(row)
+    with open(output_path, "w", encoding="utf-8-sig", newline="") as out_f:
+        writer = csv.writer(out_f)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
 
     return translated_rows, failed_rows
 
@@ -337,13 +939,13 @@ def main() -> None:
         "--sleep",
         type=float,
         default=0.5,
-        help="リクエスト間隔（秒）（デフォルト: 0.5）",
+        help="リトライの初期待機秒（指数バックオフの基点、デフォルト: 0.5）",
     )
     parser.add_argument(
         "--workers",
         type=int,
         default=0,
-        help="並列ワーカー数（0 = os.cpu_count() or 8）",
+        help="全ファイル合計の同時リクエスト数（0 = 8）",
     )
     parser.add_argument(
         "--max-rows",
@@ -351,11 +953,27 @@ def main() -> None:
         default=0,
         help="最大翻訳行数（0 = 無制限）",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="1リクエストにまとめる行数（デフォルト: 20、1 = 従来の行単位）",
+    )
     parser.add_argument(
         "--report",
         default="missing_translation_report.csv",
         help="漏訳レポートのパス（デフォルト: input_dir/missing_translation_report.csv）",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="翻訳キャッシュを使わない",
+    )
+    parser.add_argument(
+        "--cache-path",
+        default=DEFAULT_CACHE_FILENAME,
+        help=f"翻訳キャッシュ DB のパス（デフォルト: input_dir/{DEFAULT_CACHE_FILENAME}）",
+    )
     parser.add_argument(
         "--scan-all",
         action="store_true",
@@ -395,23 +1013,31 @@ def main() -> None:
         and os.path.isfile(os.path.join(input_dir, name))
     )
 
-    max_workers = args.workers if args.workers > 0 else (os.cpu_count() or 8)
-    max_workers = min(max_workers, len(csv_files) or 1)
+    concurrency = args.workers if args.workers > 0 else 8
 
-    # グローバルソケットタイムアウト（urllib の timeout を補完）
-    socket.setdefaulttimeout(120)
+    if args.no_cache:
+        cache = None
+    else:
+        cache_path = args.cache_path
+        if not os.path.isabs(cache_path):
+            cache_path = os.path.join(input_dir, cache_path)
+        cache = TranslationCache(cache_path)
+        print(f"翻訳キャッシュ: {cache_path}")
 
-    print(f"並列ワーカー数: {max_workers}, 対象ファイル数: {len(csv_files)}")
+    print(f"同時リクエスト数: {concurrency}, 対象ファイル数: {len(csv_files)}")
 
     total_translated = 0
     total_failed = 0
 
-    def _process_one(name: str) -> Tuple[str, int, int]:
+    async def _process_one(limiter: AdaptiveLimiter, name: str) -> Tuple[str, int, int]:
         src = os.path.join(input_dir, name)
         dst = os.path.join(output_dir, name)
-        report_targets = report_targets_by_file.get(name) if report_targets_by_file is not None else None
+        # レポート使用時、レポートに載っていないファイルは空集合を渡して
+        # process_file のコピーのみの高速パスに乗せる
+        report_targets = report_targets_by_file.get(name, set()) if report_targets_by_file is not None else None
 
-        translated, failed = process_file(
+        translated, failed = await process_file(
+            limiter=limiter,
             file_path=src,
             output_path=dst,
             api_key=api_key,
@@ -421,21 +1047,42 @@ def main() -> None:
             sleep_sec=max(0.0, args.sleep),
             max_rows=args.max_rows,
             report_targets=report_targets,
+            cache=cache,
+            batch_size=args.batch_size,
         )
         print(f"{name}: translated {translated}, failed {failed}")
         return name, translated, failed
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_process_one, name): name for name in csv_files}
-        for future in concurrent.futures.as_completed(futures):
-            name = futures[future]
-            try:
-                _, translated, failed = future.result()
-                total_translated += translated
-                total_failed += failed
-            except Exception as e:
-                print(f"{name}: EXCEPTION: {e}")
-                total_failed += 1
+    async def _run_all(names: List[str]) -> List[Tuple[str, int, int]]:
+        limiter = AdaptiveLimiter(
+            initial=concurrency,
+            max_limit=args.workers if args.workers > 0 else 64,
+        )
+        # to_thread が使う既定エグゼキュータはリミッターの上限まで広げておく
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(
+            concurrent.futures.ThreadPoolExecutor(max_workers=limiter.max_limit)
+        )
+        results = await asyncio.gather(
+            *[_process_one(limiter, name) for name in names],
+            return_exceptions=True,
+        )
+        out: List[Tuple[str, int, int]] = []
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                print(f"{name}: EXCEPTION: {result}")
+                out.append((name, 0, 1))
+            else:
+                out.append(result)
+        return out
+
+    try:
+        for _, translated, failed in asyncio.run(_run_all(csv_files)):
+            total_translated += translated
+            total_failed += failed
+    finally:
+        if cache is not None:
+            cache.close()
 
     print("-" * 48)
     print(f"files processed: {len(csv_files)}")
@@ -5,10 +5,19 @@ CSVファイルの ja 列を読み込み、表示上15文字以上のテキス
 """
 
 import argparse
+import concurrent.futures
 import csv
 import os
 import re
-from typing import List, Tuple
+from typing import Dict, List, Sequence, Tuple
+
+# numba があれば折り返し位置の探索を JIT コンパイルする（なければ純 Python）
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+    np = None
 
 # [tag:param] or [/tag] — formatting/control tags (zero display width)
 TAG_PATTERN = re.compile(r"\[/?[^\[\]]+\]")
@@ -17,27 +26,17 @@ IMG_TAG_PATTERN = re.compile(r"\[img:\w+\]")
 # HTML entities like &nbsp; (display width = 1)
 ENTITY_PATTERN = re.compile(r"&\w+;")
 
-REPORT_FILES = {"m_newline_scan_report.csv", "missing_translation_report.csv"}
-
+# tokenize 用の融合パターン。1回の走査でタグ・変数・エンティティ・
+# ASCII英数字の連続（分割不可の単語）をまとめて拾う。
+_COMBINED_PATTERN = re.compile(
+    r"(\[img:\w+\])"       # group 1: img tag (width=1)
+    r"|(\[/?[^\[\]]+\])"   # group 2: other tags (width=0)
+    r"|(\{[^{}]+\})"       # group 3: template variable e.g. {catname}
+    r"|(&\w+;)"            # group 4: HTML entity (width=1)
+    r"|([A-Za-z0-9]+)"     # group 5: ASCII word/number (width=len, unbreakable)
+)
 
-def _tokenize_plain(text: str) -> List[Tuple[str, int]]:
-    """プレーンテキスト部分をトークンに分割する。
-
-    連続するASCII英数字（英単語・数値）はまとめて1トークンにし、
-    途中で改行されないようにする。表示幅は文字数分。
-    """
-    tokens: List[Tuple[str, int]] = []
-    ascii_word = re.compile(r"[A-Za-z0-9]+")
-    pos = 0
-    for m in ascii_word.finditer(text):
-        for ch in text[pos:m.start()]:
-            tokens.append((ch, 1))
-        word = m.group(0)
-        tokens.append((word, len(word)))
-        pos = m.end()
-    for ch in text[pos:]:
-        tokens.append((ch, 1))
-    return tokens
+REPORT_FILES = {"m_newline_scan_report.csv", "missing_translation_report.csv"}
 
 
 def tokenize(text: str) -> List[Tuple[str, int]]:
@@ -50,20 +49,17 @@ def tokenize(text: str) -> List[Tuple[str, int]]:
     - &nbsp; 等のHTMLエンティティ: 表示幅1
     - 連続するASCII英数字（英単語）: 表示幅=文字数（分割不可）
     - 通常の文字: 表示幅1
+
+    モジュールロード時にコンパイル済みの _COMBINED_PATTERN による
+    1パス走査で、全トークン種をまとめて切り出す。
     """
     tokens: List[Tuple[str, int]] = []
-    combined = re.compile(
-        r"(\[img:\w+\])"       # group 1: img tag (width=1)
-        r"|(\[/?[^\[\]]+\])"   # group 2: other tags (width=0)
-        r"|(\{[^{}]+\})"       # group 3: template variable e.g. {catname}
-        r"|(&\w+;)"            # group 4: HTML entity (width=1)
-    )
 
     pos = 0
-    for m in combined.finditer(text):
-        # Plain text before this match — split into words/chars
+    for m in _COMBINED_PATTERN.finditer(text):
+        # Plain text before this match — one token per character
         if m.start() > pos:
-            tokens.extend(_tokenize_plain(text[pos:m.start()]))
+            tokens.extend((ch, 1) for ch in text[pos:m.start()])
 
         if m.group(1):    # [img:xxx]
             tokens.append((m.group(1), 1))
@@ -74,40 +70,82 @@ def tokenize(text: str) -> List[Tuple[str, int]]:
             tokens.append((var, len(var)))
         elif m.group(4):  # &entity;
             tokens.append((m.group(4), 1))
+        else:             # ASCII word/number
+            word = m.group(5)
+            tokens.append((word, len(word)))
 
         pos = m.end()
 
     # Remaining plain text
     if pos < len(text):
-        tokens.extend(_tokenize_plain(text[pos:]))
+        tokens.extend((ch, 1) for ch in text[pos:])
 
     return tokens
 
 
+def _py_find_cuts(widths: Sequence[int], max_len: int) -> List[int]:
+    """改行を挿入するトークン番号を返す（そのトークンの直前で改行する）。"""
+    cuts: List[int] = []
+    current = 0
+    for i, w in enumerate(widths):
+        if i > 0 and w > 0 and current + w > max_len:
+            cuts.append(i)
+            current = w
+        else:
+            current += w
+    return cuts
+
+
+if numba is not None:
+    # cache=True でコンパイル結果をディスクに残し、ProcessPoolExecutor の
+    # ワーカープロセスでも再コンパイルなしで使えるようにする
+    @numba.njit(cache=True)
+    def _numba_find_cuts(widths, max_len):  # pragma: no cover - numba 環境のみ
+        cuts = np.empty(widths.shape[0], dtype=np.int32)
+        n = 0
+        current = 0
+        for i in range(widths.shape[0]):
+            w = widths[i]
+            if i > 0 and w > 0 and current + w > max_len:
+                cuts[n] = i
+                n += 1
+                current = w
+            else:
+                current += w
+        return cuts[:n]
+
+    def find_cuts(widths: Sequence[int], max_len: int) -> Sequence[int]:
+        return _numba_find_cuts(np.asarray(widths, dtype=np.int32), max_len)
+else:
+    find_cuts = _py_find_cuts
+
+
 def wrap_segment(segment: str, max_len: int) -> str:
     """1行分のテキストを max_len 表示文字ごとに改行する。"""
+    # 文字数は表示幅の上限（タグ等の幅は文字数以下）なので、
+    # 収まることが確定していればトークナイズ自体を省略できる
+    if len(segment) <= max_len:
+        return segment
+
     tokens = tokenize(segment)
 
     # Calculate total display length
-    total_display = sum(w for _, w in tokens)
-    if total_display <= max_len:
+    widths = [w for _, w in tokens]
+    if sum(widths) <= max_len:
         return segment
 
-    lines: List[str] = []
-    current = ""
-    current_display = 0
-
-    for token_str, token_width in tokens:
-        if token_width > 0 and current_display + token_width > max_len and current:
-            lines.append(current)
-            current = token_str
-            current_display = token_width
-        else:
-            current += token_str
-            current_display += token_width
+    # 折り返し位置の探索は数値配列だけで完結するので JIT 化できる。
+    # 文字列の組み立ては得られた位置から Python 側で行う
+    cuts = find_cuts(widths, max_len)
+    if len(cuts) == 0:
+        return segment
 
-    if current:
-        lines.append(current)
+    lines: List[str] = []
+    prev = 0
+    for cut in cuts:
+        lines.append("".join(t for t, _ in tokens[prev:cut]))
+        prev = cut
+    lines.append("".join(t for t, _ in tokens[prev:]))
 
     return "\n".join(lines)
 
@@ -117,52 +155,99 @@ def wrap_ja_text(text: str, max_len: int) -> Tuple[str, bool]:
     if not text:
         return text, False
 
+    # 文字数が収まる単一行はトークナイズせずそのまま返す
+    if len(text) <= max_len and "\n" not in text:
+        return text, False
+
     parts = text.split("\n")
     wrapped_parts = [wrap_segment(part, max_len) for part in parts]
     wrapped = "\n".join(wrapped_parts)
     return wrapped, wrapped != text
 
 
-def process_file(filepath: str, max_len: int, dry_run: bool) -> Tuple[int, int]:
-    """1つのCSVファイルを処理する。変更行数と追加改行数を返す。"""
-    with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames or []
-        rows = list(reader)
+def _wrap_row(row: List[str], key_idx: int, ja_idx: int, max_len: int, dry_run: bool) -> int:
+    """1行の ja 列を折り返す。追加した改行数を返す（変更なしなら -1）。"""
+    if ja_idx >= len(row):
+        return -1
+
+    key = row[key_idx].strip() if key_idx < len(row) else ""
+    if not key or key.startswith("//"):
+        return -1
+
+    original = row[ja_idx]
+    if not original:
+        return -1
 
-    if "ja" not in fieldnames:
-        return 0, 0
+    wrapped, changed = wrap_ja_text(original, max_len)
+    if not changed:
+        return -1
 
-    rows_changed = 0
+    if dry_run:
+        print(f"  [{key}]")
+        print(f"    before: {repr(original)}")
+        print(f"    after:  {repr(wrapped)}")
+    row[ja_idx] = wrapped
+    return wrapped.count("\n") - original.count("\n")
+
+
+def process_file(filepath: str, max_len: int, dry_run: bool) -> Tuple[int, int]:
+    """1つのCSVファイルを処理する。変更行数と追加改行数を返す。
+
+    1パス目は読み取りだけで (行番号, 折り返し後の値) を集め、変更が
+    なければファイルに一切書き込まない（再実行時は読み取りスキャンのみ）。
+    変更があった場合のみ2パス目で一時ファイルへストリームコピーし、
+    記録済みの行だけ値を差し替えて os.replace する。
+    """
+    changes: Dict[int, str] = {}
     wraps_added = 0
 
-    for row in rows:
-        key = (row.get("KEY") or "").strip()
-        if not key or key.startswith("//"):
-            continue
-
-        original = row.get("ja")
-        if not original:
-            continue
-
-        wrapped, changed = wrap_ja_text(original, max_len)
-        if changed:
-            if dry_run:
-                print(f"  [{key}]")
-                print(f"    before: {repr(original)}")
-                print(f"    after:  {repr(wrapped)}")
-            row["ja"] = wrapped
-            rows_changed += 1
-            wraps_added += wrapped.count("\n") - original.count("\n")
-
-    if not dry_run and rows_changed > 0:
-        with open(filepath, "w", encoding="utf-8-sig", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in rows:
+    with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+
+        if "ja" not in header:
+            return 0, 0
+
+        key_idx = header.index("KEY") if "KEY" in header else 0
+        ja_idx = header.index("ja")
+
+        for i, row in enumerate(reader):
+            added = _wrap_row(row, key_idx, ja_idx, max_len, dry_run)
+            if added >= 0:
+                changes[i] = row[ja_idx]
+                wraps_added += added
+
+    if not changes or dry_run:
+        return len(changes), wraps_added
+
+    tmp_path = filepath + ".tmp"
+    try:
+        with open(filepath, "r", encoding="utf-8-sig", newline="") as f, open(
+            tmp_path, "w", encoding="utf-8-sig", newline=""
+        ) as out_f:
+            reader = csv.reader(f)
+            writer = csv.writer(out_f)
+            writer.writerow(next(reader))
+            for i, row in enumerate(reader):
+                new_value = changes.get(i)
+                if new_value is not None:
+                    row[ja_idx] = new_value
                 writer.writerow(row)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, filepath)
+
+    return len(changes), wraps_added
+
 
-    return rows_changed, wraps_added
+def _process_one(task: Tuple[str, str, int, bool]) -> Tuple[str, int, int]:
+    """ProcessPoolExecutor 用のトップレベルワーカー（pickle 可能にするため）。"""
+    name, filepath, max_len, dry_run = task
+    rows_changed, wraps_added = process_file(filepath, max_len, dry_run)
+    return name, rows_changed, wraps_added
 
 
 def main() -> None:
@@ -204,13 +289,22 @@ def main() -> None:
     total_rows = 0
     total_wraps = 0
 
-    for name in csv_files:
-        filepath = os.path.join(input_dir, name)
-        rows_changed, wraps_added = process_file(filepath, args.max_len, args.dry_run)
-        total_rows += rows_changed
-        total_wraps += wraps_added
-        status = f"rows: {rows_changed}, wraps: +{wraps_added}" if rows_changed else "変更なし"
-        print(f"{name}: {status}")
+    if numba is not None:
+        # ワーカー起動前に一度呼んで JIT コンパイルを済ませておく
+        # （cache=True なので子プロセスはディスクキャッシュを読むだけ）
+        find_cuts([1] * (args.max_len + 1), args.max_len)
+
+    # ファイル単位で独立な正規表現処理なので、コア数分のプロセスで並列化する
+    tasks = [
+        (name, os.path.join(input_dir, name), args.max_len, args.dry_run)
+        for name in csv_files
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for name, rows_changed, wraps_added in executor.map(_process_one, tasks):
+            total_rows += rows_changed
+            total_wraps += wraps_added
+            status = f"rows: {rows_changed}, wraps: +{wraps_added}" if rows_changed else "変更なし"
+            print(f"{name}: {status}")
 
     print("-" * 48)
     print(f"変更行数合計: {total_rows}")
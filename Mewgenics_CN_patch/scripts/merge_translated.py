@@ -1,8 +1,19 @@
 import argparse
+import concurrent.futures
 import csv
 import os
 from typing import Dict, Optional, Tuple
 
+# pyarrow があれば一括読み書きの高速パスを使う（なければ標準 csv にフォールバック）
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
 
 def normalize_text(value: Optional[str]) -> str:
     if value is None:
@@ -10,6 +21,87 @@ def normalize_text(value: Optional[str]) -> str:
     return value.strip()
 
 
+def load_translated_index(translated_path: str, target_col: str) -> Dict[str, str]:
+    """翻訳済み CSV から KEY → 訳文 の索引を作る（値が空の行は除く）。"""
+    with open(translated_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+
+        if "KEY" not in header or target_col not in header:
+            return {}
+
+        key_idx = header.index("KEY")
+        val_idx = header.index(target_col)
+        n_cols = max(key_idx, val_idx) + 1
+
+        # csv.reader の値は None にならないので str.strip を直接使える
+        strip = str.strip
+        return {
+            key: value
+            for key, value in (
+                (strip(row[key_idx]), row[val_idx])
+                for row in reader
+                if len(row) >= n_cols
+            )
+            if key and strip(value)
+        }
+
+
+def _merge_file_arrow(
+    base_path: str,
+    write_path: str,
+    target_col: str,
+    translated_index: Dict[str, str],
+) -> Optional[Tuple[int, int]]:
+    """pyarrow による一括マージ。適用できない場合は None を返して呼び元にフォールバックさせる。"""
+    with open(base_path, "r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f), None) or []
+    if "KEY" not in header or target_col not in header:
+        return 0, 0
+
+    try:
+        table = pacsv.read_csv(
+            base_path,
+            # 値の再フォーマットを避けるため全列を文字列として読む
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in header}
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+
+    # utf-8-sig の BOM が先頭列名に残ることがあるので除去する
+    table = table.rename_columns([name.lstrip("\ufeff") for name in table.column_names])
+
+    keys = table.column("KEY").to_pylist()
+    current = table.column(target_col).to_pylist()
+
+    merged = 0
+    skipped = 0
+    new_values = []
+    index_get = translated_index.get
+    for key, value in zip(keys, current):
+        hit = index_get(normalize_text(key))
+        if hit is None:
+            new_values.append(value or "")
+        elif normalize_text(value):
+            skipped += 1
+            new_values.append(value or "")
+        else:
+            merged += 1
+            new_values.append(hit)
+
+    col_idx = table.column_names.index(target_col)
+    table = table.set_column(col_idx, target_col, pa.array(new_values, type=pa.string()))
+
+    with open(write_path, "wb") as f:
+        f.write(UTF8_BOM)
+        pacsv.write_csv(
+            table, f, write_options=pacsv.WriteOptions(quoting_style="needed")
+        )
+    return merged, skipped
+
+
 def merge_file(
     base_path: str,
     translated_path: str,
@@ -17,54 +109,75 @@ def merge_file(
     target_col: str,
 ) -> Tuple[int, int]:
     """translated_path の target_col を base_path にマージし output_path に出力する。"""
-    with open(translated_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        translated_fieldnames = reader.fieldnames or []
-        translated_rows = list(reader)
-
-    if "KEY" not in translated_fieldnames or target_col not in translated_fieldnames:
-        return 0, 0
-
-    translated_index: Dict[str, str] = {}
-    for row in translated_rows:
-        key = normalize_text(row.get("KEY"))
-        value = row.get(target_col) or ""
-        if key and normalize_text(value):
-            translated_index[key] = value
-
+    # 翻訳済みインデックスは小さいのでメモリに保持し、本番 CSV はストリーム処理する
+    # 行は dict 化せず、先に引いた列インデックスでリストのまま扱う
+    translated_index = load_translated_index(translated_path, target_col)
     if not translated_index:
         return 0, 0
 
-    with open(base_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        base_fieldnames = reader.fieldnames or []
-        base_rows = list(reader)
+    # --inplace では入力を読みながら直接上書きできないため、一時ファイル経由にする
+    inplace = os.path.abspath(output_path) == os.path.abspath(base_path)
+    write_path = output_path + ".tmp" if inplace else output_path
 
-    if target_col not in base_fieldnames:
-        return 0, 0
+    if pa is not None:
+        result = _merge_file_arrow(base_path, write_path, target_col, translated_index)
+        if result is not None:
+            # 列不足などで書き出し自体が行われないケースがある
+            if inplace and os.path.exists(write_path):
+                os.replace(write_path, output_path)
+            return result
 
     merged = 0
     skipped = 0
 
-    with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=base_fieldnames)
-        writer.writeheader()
+    with open(base_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        base_header = next(reader, None) or []
+
+        if "KEY" not in base_header or target_col not in base_header:
+            return 0, 0
+
+        base_key_idx = base_header.index("KEY")
+        base_val_idx = base_header.index(target_col)
+        base_n_cols = max(base_key_idx, base_val_idx) + 1
+
+        with open(write_path, "w", encoding="utf-8-sig", newline="") as out_f:
+            writer = csv.writer(out_f)
+            writer.writerow(base_header)
+
+            # ホットループではメソッド参照をローカルに束縛して辞書検索を1回に抑える
+            index_get = translated_index.get
+            strip = str.strip
+            write_row = writer.writerow
 
-        for row in base_rows:
-            key = normalize_text(row.get("KEY"))
-            current_value = normalize_text(row.get(target_col))
+            for row in reader:
+                if len(row) < base_n_cols:
+                    write_row(row)
+                    continue
 
-            if key in translated_index and not current_value:
-                row[target_col] = translated_index[key]
-                merged += 1
-            elif key in translated_index and current_value:
-                skipped += 1
+                hit = index_get(strip(row[base_key_idx]))
+                if hit is not None:
+                    if strip(row[base_val_idx]):
+                        skipped += 1
+                    else:
+                        row[base_val_idx] = hit
+                        merged += 1
 
-            writer.writerow(row)
+                write_row(row)
+
+    if inplace:
+        os.replace(write_path, output_path)
 
     return merged, skipped
 
 
+def _process_one(task: Tuple[str, str, str, str, str]) -> Tuple[str, int, int]:
+    """ProcessPoolExecutor 用のトップレベルワーカー（pickle 可能にするため）。"""
+    name, base_path, translated_path, output_path, target_col = task
+    merged, skipped = merge_file(base_path, translated_path, output_path, target_col)
+    return name, merged, skipped
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="翻訳済み CSV (ai_translated_output) の内容を本番 CSV にマージする。"
@@ -115,19 +228,28 @@ def main() -> None:
     total_merged = 0
     total_skipped = 0
 
+    # ファイル単位で独立なので、コア数分のプロセスで並列処理する
+    tasks = []
     for name in translated_files:
         base_path = os.path.join(base_dir, name)
-        translated_path = os.path.join(translated_dir, name)
-        output_path = os.path.join(output_dir, name)
-
         if not os.path.isfile(base_path):
             print(f"{name}: skipped (not in base dir)")
             continue
+        tasks.append(
+            (
+                name,
+                base_path,
+                os.path.join(translated_dir, name),
+                os.path.join(output_dir, name),
+                args.target_col,
+            )
+        )
 
-        merged, skipped = merge_file(base_path, translated_path, output_path, args.target_col)
-        total_merged += merged
-        total_skipped += skipped
-        print(f"{name}: merged {merged}, skipped {skipped} (already filled)")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for name, merged, skipped in executor.map(_process_one, tasks):
+            total_merged += merged
+            total_skipped += skipped
+            print(f"{name}: merged {merged}, skipped {skipped} (already filled)")
 
     print("-" * 48)
     print(f"total merged: {total_merged}")